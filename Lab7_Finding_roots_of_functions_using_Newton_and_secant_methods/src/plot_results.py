@@ -1,11 +1,10 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.colors as colors
-import seaborn as sns
 import numpy as np
 import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 
 # --- Konfiguracja ---
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -25,6 +24,10 @@ OUTPUT_FORMAT = 'png'
 VECTOR_FORMATS = ['pdf', 'svg', 'eps']
 RASTER_DPI = 300
 ANNOT_FONT_SIZE = 6
+TABLES_ONLY_FLAG = '--tables-only' # Argument wiersza poleceń: tylko tabele, bez importu bibliotek wykresów
+ANNOT_MAX_CELLS = 500 # Powyżej tej liczby komórek adnotacje są pomijane (jeden obiekt Text na komórkę)
+ANNOT_MAX_CELLS_VECTOR = 400 # Niższy limit dla pdf/svg/eps - każda etykieta to osobna ścieżka w pliku
+CELL_EDGES_MAX_CELLS = 400 # Rastrowe heatmapy od tej liczby komórek bez obramowań (obrys każdej komórki osobno)
 
 REFERENCE_ROOT_1 = 0.0
 REFERENCE_ROOT_2 = -1.0
@@ -40,42 +43,144 @@ METHOD_TRANSLATIONS = {
     "Secant": "Metoda siecznych"
 }
 
+# Schemat CSV - kolumny parsowane od razu do docelowych typów (bez drugiego przebiegu konwersji)
+CSV_DTYPES = {'Method': 'category', 'StopCriterion': 'category',
+              'x0': 'float64', 'x1': 'float64', 'PrecisionRho': 'float64', 'Root': 'float64',
+              'Iterations': 'float64', 'FinalError': 'float64', 'Status': 'Int8'}
+# Tokeny wartości nieskończonych/niezdefiniowanych z programu w C -> NaN już przy odczycie
+CSV_NA_VALUES = ['NAN', 'nan', 'NaN', 'inf', 'Inf', '-inf', '-Inf']
+# Silnik read_csv. 'pyarrow' jest szybszy, ale zaokrągla część liczb inaczej w ostatniej cyfrze (ulp) niż silnik C;
+# zmienia to np. błędy x0 = a metody siecznych w tabelach i skalę (LogNorm) heatmap błędu - stąd jawnie 'c'
+CSV_ENGINE = 'c'
+
+# Szablon komórki pierwiastka w pełnych tabelach: pierwiastek (minimalny błąd względem pierwiastków odniesienia)
+ROOT_ERROR_TEMPLATE_PL = '%.5f (Błąd: %.1e)'
+
+# Precyzja klucza stałego x0 przy grupowaniu wierszy metody siecznych (zamiast np.isclose)
+FIXED_X0_KEY_DECIMALS = 6
+
+# Wartości heatmap (iteracje i błąd) - liczone jedną tabelą przestawną na przypadek
+HEATMAP_PIVOT_AGGFUNCS = {'Iterations': 'first', 'RootError': 'min'}
+# Brak błędu (przebieg niezbieżny) rysowany jako duży błąd - uzupełniane w wierszach przypadku, przed tabelą przestawną
+HEATMAP_PIVOT_FILL_VALUES = {'RootError': 10.0}
+
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(TABLE_DIR, exist_ok=True)
 os.makedirs(LATEX_FORMAT_TABLE_DIR, exist_ok=True)
 
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\s.-]') # Kompilowane raz, nie przy każdej nazwie pliku
+
+@lru_cache(maxsize=None) # Te same nazwy metod/kryteriów wracają w każdej tabeli
 def sanitize_filename(name):
     name = name.replace(" ", "_")
-    name = re.sub(r'[^\w\s.-]', '', name)
+    name = UNSAFE_FILENAME_CHARS.sub('', name)
     return name
 
-def format_root_for_latex(root_value, status):
-    if status == 1: return "MaxIter"
-    if status == 2: return "Stagnacja"
-    if status != 0: return f"Błąd ({status})"
-    if pd.isna(root_value): return "NaN"
-    return f"{root_value:.6f}"
-
-def format_root_error_pl(root_value, status):
-    if status == 1: return f"BŁĄD (MaxIter)"
-    if status == 2: return f"BŁĄD (Stagnacja)"
-    if status != 0: return f"BŁĄD ({status})"
-    if pd.isna(root_value): return "NaN"
-    err1 = abs(root_value - REFERENCE_ROOT_1)
-    err2 = abs(root_value - REFERENCE_ROOT_2)
-    min_err = min(err1, err2)
-    return f"{root_value:.5f} (Błąd: {min_err:.1e})"
+@lru_cache(maxsize=None) # Kilka precyzji, wspólnych dla wszystkich tabel
+def latex_precision_label(rho):
+    rho_str_latex = f"{rho:.0e}".replace("e-0", "e-").replace("e+0", "e")
+    return f"$\\rho={rho_str_latex}$"
+
+def format_roots_latex(root_values, statuses):
+    """Formatuje całą kolumnę pierwiastków tabeli LaTeX naraz; Python tylko przy składaniu napisów."""
+    roots = np.asarray(root_values, dtype=float)
+    statuses = np.asarray(statuses)
+    formatted = np.full(len(roots), "NaN", dtype=object)
+    converged = (statuses == 0) & ~np.isnan(roots)
+    formatted[converged] = list(map('%.6f'.__mod__, roots[converged].tolist()))
+    formatted[statuses == 1] = "MaxIter"
+    formatted[statuses == 2] = "Stagnacja"
+    other_error = ~(statuses == 0) & ~(statuses == 1) & ~(statuses == 2)
+    formatted[other_error] = [f"Błąd ({s})" for s in statuses[other_error]]
+    return formatted
+
+def min_reference_root_error(roots):
+    """min(|r - REFERENCE_ROOT_1|, |r - REFERENCE_ROOT_2|) dla tablicy pierwiastków; dwa bufory zamiast czterech tymczasowych tablic."""
+    err = np.subtract(roots, REFERENCE_ROOT_1)
+    np.abs(err, out=err)
+    err_2 = np.subtract(roots, REFERENCE_ROOT_2)
+    np.abs(err_2, out=err_2)
+    return np.minimum(err, err_2, out=err)
+
+def format_root_error_pl(root_values, statuses):
+    """Formatuje całą kolumnę pierwiastków (z błędem) naraz; błędy liczone wektorowo w NumPy."""
+    roots = np.asarray(root_values, dtype=float)
+    statuses = np.asarray(statuses)
+    min_err = min_reference_root_error(roots)
+    formatted = np.full(len(roots), "NaN", dtype=object)
+    converged = (statuses == 0) & ~np.isnan(roots)
+    # Jeden szablon printf na pary natywnych floatów (tolist) - bez iteracji po skalarach NumPy
+    formatted[converged] = list(map(ROOT_ERROR_TEMPLATE_PL.__mod__,
+                                    zip(roots[converged].tolist(), min_err[converged].tolist())))
+    formatted[statuses == 1] = "BŁĄD (MaxIter)"
+    formatted[statuses == 2] = "BŁĄD (Stagnacja)"
+    other_error = ~(statuses == 0) & ~(statuses == 1) & ~(statuses == 2)
+    formatted[other_error] = [f"BŁĄD ({s})" for s in statuses[other_error]]
+    return formatted
+
+def format_iterations_pl(iterations, statuses):
+    """Formatuje całą kolumnę iteracji naraz: liczba iteracji dla zbieżnych, w pozostałych komórkach kod statusu."""
+    iterations = np.asarray(iterations, dtype=float)
+    statuses = np.asarray(statuses, dtype=float)
+    formatted = np.full(len(iterations), "BŁĄD (?)", dtype=object) # Brak statusu
+    ok = (statuses == 0) & ~np.isnan(iterations)
+    formatted[ok] = iterations[ok].astype(np.int64).tolist() # Natywne int (nie str) - to_string wyrównuje je jak liczby
+    error = ~ok & ~np.isnan(statuses)
+    formatted[error] = list(map("BŁĄD ({})".format, statuses[error].astype(np.int64).tolist()))
+    return formatted
+
+def pivot_values_table(df, index, columns, values, aggfunc='first'):
+    """pivot_table bez grupowania: przy unikalnych parach (index, columns) agregacja jest tożsamością, więc wystarcza DataFrame.pivot."""
+    if df.duplicated([index, columns]).any():
+        return pd.pivot_table(df, index=index, columns=columns, values=values, aggfunc=aggfunc)
+    # Jak pivot_table (dropna=True): bez wierszy i kolumn zawierających same NaN
+    table = df.pivot(index=index, columns=columns, values=values).dropna(how='all').dropna(axis=1, how='all')
+    # Jak pivot_table: kolumny z całkowitych danych wejściowych wracają do int, jeśli nie mają braków
+    single_value = isinstance(values, str)
+    for v in ([values] if single_value else values):
+        if pd.api.types.is_integer_dtype(df[v]):
+            cols = table.columns if single_value else [c for c in table.columns if c[0] == v]
+            for c in cols:
+                if table[c].notna().all():
+                    table[c] = table[c].astype(np.int64)
+    return table
+
+def round_iterated_points(df):
+    """Zaokrągla raz, przy wczytaniu, iterowane punkty startowe (oś tabel i heatmap): x0 dla Newtona, x1 dla siecznych."""
+    df['x0'] = df['x0'].mask(df['Method'] == 'Newton', df['x0'].round(1))
+    df['x1'] = df['x1'].mask(df['Method'] == 'Secant', df['x1'].round(1))
+
+def group_by_method_and_criterion(df):
+    """Grupuje wiersze raz, po (Method, StopCriterion) -> {(metoda, kryterium): DataFrame}; zamiast masek na całej ramce."""
+    return dict(tuple(df.groupby(['Method', 'StopCriterion'], observed=True, sort=False)))
+
+def group_secant_by_fixed_x0(df):
+    """Grupuje wiersze metody siecznych raz, po zaokrąglonym stałym x0 -> {klucz x0: DataFrame}."""
+    df_secant = df[df['Method'] == 'Secant']
+    return dict(tuple(df_secant.groupby(df_secant['x0'].round(FIXED_X0_KEY_DECIMALS), sort=False)))
 
 def create_pivot_table(df, method_name, stop_criterion_name,
                        fixed_x0_val_filter=None, # Filtr dla stałego x0 (używane dla metody siecznych)
+                       secant_groups=None, # Wynik group_secant_by_fixed_x0 - wyszukanie grupy zamiast np.isclose
+                       case_groups=None, # Wynik group_by_method_and_criterion - wyszukanie grupy zamiast masek
                        # x_col_iterated nie jest już potrzebny jako argument, wywnioskujemy go
-                       y_col='PrecisionRho', val_col='Iterations', aggfunc='first'):
-    """Tworzy tabelę przestawną. Dla metody siecznych, x0 jest stałe, x1 iterowane. Dla Newtona, x0 jest iterowane."""
-    df_filtered = df[(df['Method'] == method_name) & (df['StopCriterion'] == stop_criterion_name)].copy()
+                       y_col='PrecisionRho', val_col='Iterations', aggfunc='first',
+                       fill_values=None): # {kolumna: wartość} dla NaN, tylko w wierszach tego przypadku
+    """Tworzy tabelę przestawną. Dla metody siecznych, x0 jest stałe, x1 iterowane. Dla Newtona, x0 jest iterowane.
+    val_col może być listą kolumn (aggfunc jako słownik) - wtedy kolumny wyniku mają poziom nazwy wartości."""
+    use_secant_groups = method_name == 'Secant' and fixed_x0_val_filter is not None and secant_groups is not None
+    if use_secant_groups:
+        df_case = secant_groups.get(round(fixed_x0_val_filter, FIXED_X0_KEY_DECIMALS), df.iloc[:0])
+        df_filtered = df_case[df_case['StopCriterion'] == stop_criterion_name]
+    elif case_groups is not None:
+        df_filtered = case_groups.get((method_name, stop_criterion_name), df.iloc[:0])
+    else:
+        df_filtered = df[(df['Method'] == method_name) & (df['StopCriterion'] == stop_criterion_name)]
 
     if method_name == 'Secant':
         if fixed_x0_val_filter is not None:
-            df_filtered = df_filtered[np.isclose(df_filtered['x0'], fixed_x0_val_filter)]
+            if not use_secant_groups:
+                df_filtered = df_filtered[np.isclose(df_filtered['x0'], fixed_x0_val_filter)]
         else: # Powinno być zawsze podane dla Secant w tej logice
             print(f"Ostrzeżenie: Dla metody siecznych ({method_name}) oczekiwano filtra fixed_x0_val_filter.")
             return None
@@ -90,88 +195,152 @@ def create_pivot_table(df, method_name, stop_criterion_name,
         # print(f"Brak danych po filtracji dla: Metoda={method_name}, Kryt={stop_criterion_name}, Stałe x0={fixed_x0_val_filter}")
         return None
 
-    if iterated_col_for_pivot in df_filtered.columns:
-        df_filtered.loc[:, iterated_col_for_pivot] = df_filtered[iterated_col_for_pivot].round(1)
+    if fill_values:
+        df_filtered = df_filtered.fillna(fill_values)
 
     try:
         # Kolumna dla osi X heatmapy to iterowana kolumna
-        heatmap_data = pd.pivot_table(df_filtered, index=y_col, columns=iterated_col_for_pivot, values=val_col, aggfunc=aggfunc)
+        heatmap_data = pivot_values_table(df_filtered, index=y_col, columns=iterated_col_for_pivot, values=val_col, aggfunc=aggfunc)
     except Exception as e:
         print(f"Błąd tworzenia tabeli przestawnej dla {method_name}, {stop_criterion_name}, stałe x0={fixed_x0_val_filter}, iterowana kolumna={iterated_col_for_pivot}: {e}")
         return None
 
-    heatmap_data = heatmap_data.sort_index(ascending=False) # Precisions
-    heatmap_data = heatmap_data.sort_index(axis=1, ascending=True) # Iterated points
+    # Tabela przestawna ma już rosnące osie - wystarczy odwrócić wiersze; sortowanie tylko gdy kolejność nie jest rosnąca
+    if heatmap_data.index.is_monotonic_increasing:
+        heatmap_data = heatmap_data.iloc[::-1] # Precisions
+    else:
+        heatmap_data = heatmap_data.sort_index(ascending=False)
+    if not heatmap_data.columns.is_monotonic_increasing:
+        heatmap_data = heatmap_data.sort_index(axis=1, ascending=True) # Iterated points
     return heatmap_data
 
+def pivot_values(heatmap_pivots, val_col):
+    """Wycina dane jednej heatmapy z tabeli przestawnej utworzonej dla wielu kolumn wartości."""
+    if heatmap_pivots is None or val_col not in heatmap_pivots.columns.get_level_values(0):
+        return None
+    return heatmap_pivots[val_col]
+
+
+_plot_libs = None # (Figure, FigureCanvasAgg, colors, sns) po pierwszym load_plot_libs()
+
+def load_plot_libs():
+    """Importuje matplotlib/seaborn dopiero przy pierwszym wykresie - same tabele ich nie potrzebują."""
+    global _plot_libs
+    if _plot_libs is None:
+        import matplotlib
+        matplotlib.use('Agg') # Backend bez GUI, używany także przez procesy robocze
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import matplotlib.colors as colors
+        import seaborn as sns
+        _plot_libs = (Figure, FigureCanvasAgg, colors, sns)
+    return _plot_libs
+
+_heatmap_figure = None # Jedna figura na proces, czyszczona przed każdą heatmapą
+
+def get_heatmap_figure():
+    """Zwraca wyczyszczoną figurę procesu (poza rejestrem pyplot); tworzona raz, nie przy każdym wykresie."""
+    global _heatmap_figure
+    Figure, FigureCanvasAgg = load_plot_libs()[:2]
+    if _heatmap_figure is None:
+        _heatmap_figure = Figure(figsize=(14, 10))
+        FigureCanvasAgg(_heatmap_figure)
+    else:
+        _heatmap_figure.clear()
+    return _heatmap_figure
+
+def format_annotations(values, fmt):
+    """Etykiety komórek heatmapy jednym przebiegiem printf; seaborn dostaje gotowe napisy (fmt="") zamiast formatować każdą komórkę."""
+    labels = list(map(f"%{fmt}".__mod__, values.ravel().tolist())) # Komórki NaN seaborn i tak pomija (maska)
+    return np.array(labels, dtype=object).reshape(values.shape)
+
+def cell_edge_width(n_cells, output_format):
+    """Szerokość linii między komórkami: cienka w formatach wektorowych, w rastrowych tylko dla małych siatek."""
+    if output_format in VECTOR_FORMATS:
+        return 0.1
+    return .5 if n_cells < CELL_EDGES_MAX_CELLS else 0
 
 def create_heatmap(data, title, base_filename, x_axis_label, output_format='png', raster_dpi=150, # ZMIANA: x_axis_label
                    cmap=CMAP_ITER, val_label='Iteracje', log_norm=False,
                    annot=False, annot_fmt=".0f"):
+    """Rysuje i zapisuje heatmapę. Adnotacje tylko do ANNOT_MAX_CELLS komórek (ANNOT_MAX_CELLS_VECTOR dla formatów wektorowych)."""
     if data is None or data.empty:
         print(f"Pominięto heatmapę: {title} - Brak danych.")
         return
+    colors, sns = load_plot_libs()[2:]
     safe_base_filename = sanitize_filename(base_filename)
     output_path = os.path.join(OUTPUT_DIR, f"{safe_base_filename}.{output_format}")
-    plt.figure(figsize=(14, 10))
+    fig = get_heatmap_figure()
+    ax = fig.subplots()
+    annot_limit = ANNOT_MAX_CELLS_VECTOR if output_format in VECTOR_FORMATS else ANNOT_MAX_CELLS
+    if annot and data.size > annot_limit:
+        print(f"Pominięto adnotacje heatmapy ({data.size} komórek > {annot_limit}): {title}")
+        annot = False
+    arr = np.asarray(data.to_numpy(), dtype=np.float64) # Bez pośredniej Series z unstack()/dropna()
     norm = None
     cbar_label = val_label
     if log_norm:
-        valid_data = pd.to_numeric(data.unstack().dropna(), errors='coerce')
-        positive_data = valid_data[valid_data > 0]
-        min_val = positive_data.min() if not positive_data.empty else 1e-16
-        max_val = positive_data.max() if not positive_data.empty else 1.0
+        positive_data = arr[np.isfinite(arr) & (arr > 0)]
+        min_val = positive_data.min() if positive_data.size else 1e-16
+        max_val = positive_data.max() if positive_data.size else 1.0
         if min_val > 0 and max_val > min_val:
             norm = colors.LogNorm(vmin=min_val, vmax=max_val)
             cbar_label = f'{val_label} (Skala log.)'
         else:
             cbar_label = f'{val_label} (Skala lin.)'
     try:
-        sns.heatmap(data, annot=annot, fmt=annot_fmt if annot else "",
-                    linewidths=.5 if output_format not in VECTOR_FORMATS else 0.1,
+        sns.heatmap(data, annot=format_annotations(arr, annot_fmt) if annot else False, fmt="",
+                    linewidths=cell_edge_width(data.size, output_format),
                     cmap=cmap, norm=norm, cbar_kws={'label': cbar_label},
-                    annot_kws={"size": ANNOT_FONT_SIZE})
+                    annot_kws={"size": ANNOT_FONT_SIZE}, ax=ax)
     except Exception as e:
         print(f"BŁĄD podczas sns.heatmap dla {title}: {e}")
-        plt.close()
         return
-    plt.title(title, fontsize=14)
-    plt.xlabel(x_axis_label, fontsize=12) # Użycie przekazanego x_axis_label
-    plt.ylabel(f"Precyzja ρ ({data.index.name})", fontsize=12)
-    if plt.gca().get_yaxis().get_scale() == 'log':
-        plt.gca().yaxis.set_major_formatter(plt.LogFormatterSciNotation())
+    if output_format in VECTOR_FORMATS:
+        ax.collections[0].set_rasterized(True) # Siatka komórek jako obraz, osie i tekst pozostają wektorowe
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel(x_axis_label, fontsize=12) # Użycie przekazanego x_axis_label
+    ax.set_ylabel(f"Precyzja ρ ({data.index.name})", fontsize=12)
     try:
         save_kwargs = {'bbox_inches': 'tight', 'format': output_format}
-        if output_format not in VECTOR_FORMATS: save_kwargs['dpi'] = raster_dpi
-        plt.savefig(output_path, **save_kwargs)
+        save_kwargs['dpi'] = raster_dpi # W formatach wektorowych dotyczy tylko zrasteryzowanej siatki
+        fig.savefig(output_path, **save_kwargs)
         print(f"Zapisano wykres: {output_path}")
     except Exception as e:
         print(f"Błąd zapisu wykresu {output_path}: {e}")
-    plt.close()
+
+def run_heatmap_jobs(heatmap_jobs):
+    """Renderuje niezależne heatmapy równolegle w procesach roboczych; każde zadanie to partial(create_heatmap, ...)."""
+    if not heatmap_jobs:
+        return
+    with ProcessPoolExecutor(max_workers=min(len(heatmap_jobs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(job) for job in heatmap_jobs]
+        for future in futures:
+            future.result() # Przekazuje ewentualny wyjątek z procesu roboczego
 
 def generate_tables(df, precision_subset=None):
     if precision_subset is None: precision_subset = df['PrecisionRho'].unique()
     methods = df['Method'].unique()
     stop_criteria = df['StopCriterion'].unique()
+    case_groups = group_by_method_and_criterion(df)
 
     for stop_crit_key in stop_criteria:
         stop_crit_pl = STOP_CRITERION_TRANSLATIONS.get(stop_crit_key, stop_crit_key)
         print(f"\n\n=== Tabele dla kryterium stopu: {stop_crit_pl} ===")
-        df_crit_filtered = df[df['StopCriterion'] == stop_crit_key]
 
         for method_key in methods:
             method_pl = METHOD_TRANSLATIONS.get(method_key, method_key)
-            df_method_current = df_crit_filtered[df_crit_filtered['Method'] == method_key].copy()
+            df_method_current = case_groups.get((method_key, stop_crit_key), df.iloc[:0])
 
             if method_key == 'Secant':
-                fixed_x0_values_for_secant = df_method_current['x0'].dropna().unique()
-                if not fixed_x0_values_for_secant.any():
+                # Jeden podział po kluczu stałego x0 zamiast maski np.isclose dla każdej wartości
+                secant_cases = df_method_current.groupby(df_method_current['x0'].round(FIXED_X0_KEY_DECIMALS), sort=True)
+                if secant_cases.ngroups == 0:
                     print(f"  Brak danych dla metody siecznych ({method_pl}) dla kryterium {stop_crit_pl} do grupowania po x0.")
                     continue
 
-                for x0_val in sorted(fixed_x0_values_for_secant):
+                for x0_val, df_sec_case_current in secant_cases:
                     case_info = f"x0={x0_val:.2f}"
-                    df_sec_case_current = df_method_current[np.isclose(df_method_current['x0'], x0_val)].copy()
 
                     iterated_point_col_name = 'x1' # Dla siecznych, x1 jest iterowane
                     print(f"\n  Pełna tabela TXT: {method_pl} ({stop_crit_pl}), stałe {case_info}, {iterated_point_col_name} iterowane")
@@ -201,74 +370,56 @@ def generate_tables(df, precision_subset=None):
                                                          stop_criterion_key=stop_crit_key,
                                                          stop_criterion_pl=stop_crit_pl)
 
+def precisions_with_roots(df_table, precision_subset):
+    """Precyzje z precision_subset, które mają w tabeli wynikowej kolumnę 'Root' (co najmniej jeden pierwiastek nie-NaN)."""
+    available = set(df_table.loc[df_table['Root'].notna(), 'PrecisionRho'].unique())
+    return [p for p in precision_subset if p in available]
+
 def generate_single_table_full_txt(df_table, precision_subset, x_col, method_name_pl, stop_criterion_key, stop_criterion_pl, fixed_val_info=""):
     # x_col to nazwa iterowanej kolumny (x0 dla Newtona, x1 dla Siecznych)
     if df_table.empty:
         print(f"  (Pełna TXT) Brak danych dla: {method_name_pl}, {stop_criterion_pl}, {fixed_val_info if fixed_val_info else f'{x_col} iterowane'}.")
         return
+    valid_precisions = precisions_with_roots(df_table, precision_subset) # Przed tabelą przestawną
+    if not valid_precisions:
+        print(f"  (Pełna TXT) Brak danych dla podanych precyzji dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}.")
+        return
     try:
-        if x_col in df_table.columns:
-            df_table.loc[:, x_col] = df_table[x_col].round(1)
-        df_pivot = df_table.pivot_table(index=x_col, columns='PrecisionRho', values=['Root', 'Iterations', 'Status'], aggfunc='first')
+        df_pivot = pivot_values_table(df_table, index=x_col, columns='PrecisionRho', values=['Root', 'Iterations', 'Status'])
     except Exception as e:
         print(f"  (Pełna TXT) Błąd tworzenia tabeli przestawnej dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}: {e}")
         return
 
-    actual_precisions_in_pivot = []
-    if not df_pivot.empty and isinstance(df_pivot.columns, pd.MultiIndex) and len(df_pivot.columns.levels) > 1:
-        actual_precisions_in_pivot = [p for p in df_pivot.columns.levels[1] if ('Root', p) in df_pivot.columns]
-    valid_precisions = [p for p in precision_subset if p in actual_precisions_in_pivot]
-
-    if not valid_precisions:
-        print(f"  (Pełna TXT) Brak danych dla podanych precyzji dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}.")
-        return
-
     desired_value_types = ['Root', 'Iterations', 'Status']
     multi_index_for_reindex = pd.MultiIndex.from_product(
         [desired_value_types, valid_precisions], names=['ValueType', 'PrecisionRho']
     )
     df_pivot = df_pivot.reindex(columns=multi_index_for_reindex)
-    df_pivot.sort_index(ascending=True, inplace=True)
-    df_pivot.sort_index(axis=1, inplace=True)
-    df_display = pd.DataFrame(index=df_pivot.index)
-
-    for rho in valid_precisions:
-        col_name_root = f'Pierwiastek (ρ={rho:.0e})'
-        col_name_iter = f'Iteracje (ρ={rho:.0e})'
-        root_col, iter_col, status_col = ('Root', rho), ('Iterations', rho), ('Status', rho)
-        if root_col not in df_pivot.columns or status_col not in df_pivot.columns:
-            df_display[col_name_root], df_display[col_name_iter] = "BŁĄD_STRUKTURY_PIVOT", "BŁĄD_STRUKTURY_PIVOT"
-            continue
-        roots_data = df_pivot.get(root_col, pd.Series(dtype=float))
-        status_data = df_pivot.get(status_col, pd.Series(dtype=int))
-        iter_data = df_pivot.get(iter_col, pd.Series(dtype=float))
-        df_display[col_name_root] = [format_root_error_pl(r,s) for r,s in zip(roots_data, status_data)]
-        if iter_col not in df_pivot.columns:
-            df_display[col_name_iter] = "BRAK_ITERACJI"
-        else:
-            df_display[col_name_iter] = [int(i) if s==0 and pd.notna(i) else f"BŁĄD ({int(s) if pd.notna(s) else '?'})" for i,s in zip(iter_data, status_data)]
-
-    sorted_cols = [col for rho_val in valid_precisions
-                   for col in (f'Pierwiastek (ρ={rho_val:.0e})', f'Iteracje (ρ={rho_val:.0e})')
-                   if col in df_display.columns]
-    if not sorted_cols:
-        print(f"  (Pełna TXT) Brak kolumn do wyświetlenia dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}.")
-        return
-    df_display = df_display[sorted_cols]
-    df_display.index = df_display.index.map('{:.1f}'.format)
+    if not df_pivot.index.is_monotonic_increasing: # Kolumny wybierane po etykietach - ich kolejność nie ma znaczenia
+        df_pivot.sort_index(ascending=True, inplace=True)
+    # reindex gwarantuje kolumny Root/Iterations/Status dla każdej precyzji - jedna tablica komórek na całą tabelę
+    display_cols = [col for rho in valid_precisions
+                    for col in (f'Pierwiastek (ρ={rho:.0e})', f'Iteracje (ρ={rho:.0e})')]
+    cells = np.empty((len(df_pivot), len(display_cols)), dtype=object)
+    for i, rho in enumerate(valid_precisions):
+        status_data = df_pivot[('Status', rho)]
+        cells[:, 2 * i] = format_root_error_pl(df_pivot[('Root', rho)], status_data)
+        cells[:, 2 * i + 1] = format_iterations_pl(df_pivot[('Iterations', rho)], status_data)
+    # infer_objects: kolumny iteracji bez błędów wracają do int64 - to_string wyrównuje je inaczej niż kolumny object
+    df_display = pd.DataFrame(cells, index=df_pivot.index.map('{:.1f}'.format), columns=display_cols).infer_objects()
     df_display.index.name = f"Iterowany punkt {x_col}" # Nazwa indeksu to iterowana kolumna
 
     filename_parts = ["pelna_tabela", method_name_pl.lower().replace(" ", "_"), stop_criterion_key.lower()]
     if fixed_val_info: filename_parts.append(sanitize_filename(fixed_val_info.replace('x0=','xstale_').replace('.', 'p'))) # Zmieniono nazwę pliku
     txt_filename = sanitize_filename("_".join(filename_parts)) + ".txt"
     txt_path = os.path.join(TABLE_DIR, txt_filename)
+    header_info = f"Metoda: {method_name_pl}, Kryterium stopu: {stop_criterion_pl}"
+    if fixed_val_info: header_info += f", Stały punkt: {fixed_val_info}"
+    header_info += f", Iterowany punkt: {x_col}"
+    rendered = header_info + "\n\n" + df_display.to_string(index=True, justify='center')
     try:
         with open(txt_path, 'w', encoding='utf-8') as f:
-            header_info = f"Metoda: {method_name_pl}, Kryterium stopu: {stop_criterion_pl}"
-            if fixed_val_info: header_info += f", Stały punkt: {fixed_val_info}"
-            header_info += f", Iterowany punkt: {x_col}"
-            f.write(header_info)
-            f.write("\n\n" + df_display.to_string(index=True, justify='center'))
+            f.write(rendered) # Cały plik jednym zapisem
         print(f"Zapisano pełną tabelę TXT: {txt_path}")
     except Exception as e:
         print(f"Błąd zapisu pełnej tabeli TXT {txt_path}: {e}")
@@ -278,32 +429,22 @@ def generate_single_table_roots_latex_to_txt(df_table, precision_subset, x_col,
     if df_table.empty:
         print(f"  (Format LaTeX do TXT - Pierwiastki) Brak danych dla: {method_name_pl}, {stop_criterion_pl}, {fixed_val_info if fixed_val_info else f'{x_col} iterowane'}.")
         return
+    valid_precisions = precisions_with_roots(df_table, precision_subset) # Przed tabelą przestawną
+    if not valid_precisions:
+        print(f"  (Format LaTeX do TXT - Pierwiastki) Brak danych dla podanych precyzji dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}.")
+        return
     try:
-        if x_col in df_table.columns:
-            df_table.loc[:, x_col] = df_table[x_col].round(1)
-        df_pivot_roots = df_table.pivot_table(index=x_col, columns='PrecisionRho',
-                                              values=['Root', 'Status'], aggfunc='first')
+        df_pivot_roots = pivot_values_table(df_table, index=x_col, columns='PrecisionRho', values=['Root', 'Status'])
     except Exception as e:
         print(f"  (Format LaTeX do TXT - Pierwiastki) Błąd tworzenia tabeli przestawnej dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}: {e}")
         return
 
-    actual_precisions_in_pivot = []
-    if not df_pivot_roots.empty and isinstance(df_pivot_roots.columns, pd.MultiIndex) and len(df_pivot_roots.columns.levels) > 1:
-        actual_precisions_in_pivot = [p for p in df_pivot_roots.columns.levels[1] if ('Root', p) in df_pivot_roots.columns]
-    valid_precisions = [p for p in precision_subset if p in actual_precisions_in_pivot]
-
-    if not valid_precisions:
-        print(f"  (Format LaTeX do TXT - Pierwiastki) Brak danych dla podanych precyzji dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}.")
-        return
-
     df_latex_roots = pd.DataFrame(index=df_pivot_roots.index)
     for rho in valid_precisions:
         root_col_data = df_pivot_roots.get(('Root', rho), pd.Series(dtype=float))
         status_col_data = df_pivot_roots.get(('Status', rho), pd.Series(dtype=int))
-        formatted_roots = [format_root_for_latex(r, s) for r, s in zip(root_col_data, status_col_data)]
-        rho_str_latex = f"{rho:.0e}".replace("e-0", "e-").replace("e+0", "e")
-        col_name_latex = f"$\\rho={rho_str_latex}$"
-        df_latex_roots[col_name_latex] = formatted_roots
+        formatted_roots = format_roots_latex(root_col_data, status_col_data)
+        df_latex_roots[latex_precision_label(rho)] = formatted_roots
 
     if df_latex_roots.empty:
         print(f"  (Format LaTeX do TXT - Pierwiastki) Tabela jest pusta po przetworzeniu dla {method_name_pl}, {fixed_val_info}, kryt. {stop_criterion_pl}.")
@@ -343,29 +484,32 @@ def generate_single_table_roots_latex_to_txt(df_table, precision_subset, x_col,
         filename_parts.append(sanitize_filename(fixed_val_info.replace('x0=','xstale_').replace('.', 'p')))
     output_filename = sanitize_filename("_".join(filename_parts)) + ".txt"
     output_path = os.path.join(LATEX_FORMAT_TABLE_DIR, output_filename)
+    header_lines = [f"% Plik: {output_filename}",
+                    f"% Metoda: {method_name_pl}, Kryterium stopu: {stop_criterion_pl}"]
+    if fixed_val_info: header_lines.append(f"% Stały punkt: {fixed_val_info}, Iterowany punkt: {x_col}")
+    else: header_lines.append(f"% Iterowany punkt: {x_col}")
+    header_lines.append("% Aby użyć w LaTeX, skopiuj poniższą zawartość i upewnij się, że masz pakiety: booktabs, amsmath")
+    header_lines.append("% Możesz potrzebować dostosować caption i label.\n")
+    rendered = "\n".join(header_lines) + "\n" + latex_string
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"% Plik: {output_filename}\n")
-            f.write(f"% Metoda: {method_name_pl}, Kryterium stopu: {stop_criterion_pl}\n")
-            if fixed_val_info: f.write(f"% Stały punkt: {fixed_val_info}, Iterowany punkt: {x_col}\n")
-            else: f.write(f"% Iterowany punkt: {x_col}\n")
-            f.write("% Aby użyć w LaTeX, skopiuj poniższą zawartość i upewnij się, że masz pakiety: booktabs, amsmath\n")
-            f.write("% Możesz potrzebować dostosować caption i label.\n\n")
-            f.write(latex_string)
+            f.write(rendered) # Cały plik jednym zapisem
         print(f"Zapisano tabelę w formacie LaTeX do pliku TXT: {output_path}")
     except Exception as e:
         print(f"Błąd zapisu tabeli w formacie LaTeX do pliku TXT {output_path}: {e}")
 
+def read_results_csv(csv_file):
+    """Wczytuje CSV w jednym przebiegu z jawnym schematem (silnik CSV_ENGINE).
+    Tylko kolumny z CSV_DTYPES - brak którejś z nich zgłasza read_csv (ValueError)."""
+    return pd.read_csv(csv_file, engine=CSV_ENGINE, usecols=list(CSV_DTYPES), dtype=CSV_DTYPES, na_values=CSV_NA_VALUES)
+
 def infer_bounds(df):
-    x0_min, x0_max = df['x0'].min(), df['x0'].max()
-    x1_min, x1_max = np.nan, np.nan
-    if 'x1' in df.columns and not df['x1'].isna().all():
-        x1_data = df['x1'].dropna()
-        if not x1_data.empty: x1_min, x1_max = x1_data.min(), x1_data.max()
-    a_bound = np.nanmin([x0_min, x1_min]) if not (pd.isna(x0_min) and pd.isna(x1_min)) else -1.4
-    b_bound = np.nanmax([x0_max, x1_max]) if not (pd.isna(x0_max) and pd.isna(x1_max)) else 0.6
-    if pd.isna(a_bound) or pd.isna(b_bound): return -1.4, 0.6
-    return a_bound, b_bound
+    # Wszystkie punkty startowe (x0 i x1) w jednej tablicy - jedno min i jedno max zamiast czterech redukcji pandas
+    points = df['x0'].to_numpy()
+    if 'x1' in df.columns: points = np.concatenate([points, df['x1'].to_numpy()])
+    points = points[~np.isnan(points)]
+    if points.size == 0: return -1.4, 0.6
+    return points.min(), points.max()
 
 def main():
     print(f"Odczytywanie wyników z: {CSV_FILE}")
@@ -373,7 +517,7 @@ def main():
         print(f"Błąd: Plik danych nie znaleziony: {CSV_FILE}")
         sys.exit(1)
     try:
-        df = pd.read_csv(CSV_FILE)
+        df = read_results_csv(CSV_FILE)
     except Exception as e:
         print(f"Błąd odczytu pliku CSV {CSV_FILE}: {e}")
         sys.exit(1)
@@ -382,18 +526,30 @@ def main():
         print("Błąd: Plik CSV nie zawiera wymaganych kolumn.")
         sys.exit(1)
 
-    df.replace(['NAN', 'nan', 'NaN', 'inf', 'Inf', '-inf', '-Inf'], np.nan, inplace=True)
-    numeric_cols = ['x0', 'x1', 'PrecisionRho', 'Root', 'Iterations', 'FinalError']
-    for col in numeric_cols: df[col] = pd.to_numeric(df[col], errors='coerce')
-    df['Status'] = pd.to_numeric(df['Status'], errors='coerce').fillna(-1).astype(int)
+    # Typy kolumn (w tym category dla Method/StopCriterion) ustawione już przy odczycie przez CSV_DTYPES
+    df['Status'] = df['Status'].fillna(-1).astype(np.int8) # Kody statusu mieszczą się w int8
+    a_bound, b_bound = infer_bounds(df) # Przed zaokrągleniem - granice z surowych x0/x1 (np. b = 0.55, a nie 0.6)
+    round_iterated_points(df) # Stałe x0 metody siecznych pozostaje niezaokrąglone (klucz grupowania)
 
     generate_tables(df)
+    if TABLES_ONLY_FLAG in sys.argv[1:]:
+        print("\nPominięto wykresy (--tables-only).")
+        return
+    load_plot_libs() # W procesie głównym, zanim powstaną procesy robocze - dziedziczą już zaimportowane moduły
 
-    a_bound, b_bound = infer_bounds(df)
     print(f"Wywnioskowany przedział dla wykresów: [{a_bound:.2f}, {b_bound:.2f}]") # `a` i `b` zdefiniowane w function.c
     # `a_bound` i `b_bound` to granice przedziału `a` i `b`
     # używane jako stałe punkty dla metody siecznych
     stop_criteria_to_plot = df['StopCriterion'].unique()
+    heatmap_jobs = [] # Wykresy są od siebie niezależne - zbierane tutaj, renderowane równolegle po pętli
+
+    # Błąd pierwiastka liczony wektorowo (NumPy), raz dla całego DataFrame
+    roots = df['Root'].to_numpy(dtype=float)
+    root_error = min_reference_root_error(roots)
+    root_error[(df['Status'].to_numpy() != 0) | np.isnan(roots)] = np.nan # Tylko zbieżne przebiegi
+    df['RootError'] = root_error
+    secant_groups = group_secant_by_fixed_x0(df) # Raz dla wszystkich kryteriów stopu (po dodaniu kolumny błędu)
+    case_groups = group_by_method_and_criterion(df)
 
     for sc_key in stop_criteria_to_plot:
         sc_pl = STOP_CRITERION_TRANSLATIONS.get(sc_key, sc_key)
@@ -401,42 +557,45 @@ def main():
         newton_pl = METHOD_TRANSLATIONS["Newton"]
         secant_pl = METHOD_TRANSLATIONS["Secant"]
 
+        # Jedna tabela przestawna (iteracje + błąd) na przypadek, współdzielona przez obie heatmapy
+        pivots_newton = create_pivot_table(df, 'Newton', sc_key, case_groups=case_groups, val_col=list(HEATMAP_PIVOT_AGGFUNCS), aggfunc=HEATMAP_PIVOT_AGGFUNCS, fill_values=HEATMAP_PIVOT_FILL_VALUES) # Dla Newtona, fixed_x0_val_filter jest None, iterowana jest x0
+        pivots_sec_a = create_pivot_table(df, 'Secant', sc_key, fixed_x0_val_filter=a_bound, secant_groups=secant_groups, val_col=list(HEATMAP_PIVOT_AGGFUNCS), aggfunc=HEATMAP_PIVOT_AGGFUNCS, fill_values=HEATMAP_PIVOT_FILL_VALUES)
+        pivots_sec_b = create_pivot_table(df, 'Secant', sc_key, fixed_x0_val_filter=b_bound, secant_groups=secant_groups, val_col=list(HEATMAP_PIVOT_AGGFUNCS), aggfunc=HEATMAP_PIVOT_AGGFUNCS, fill_values=HEATMAP_PIVOT_FILL_VALUES)
+
         # Metoda Newtona - x0 iterowane
-        pivot_newton_iter = create_pivot_table(df, 'Newton', sc_key, val_col='Iterations') # Dla Newtona, fixed_x0_val_filter jest None, iterowana jest x0
+        pivot_newton_iter = pivot_values(pivots_newton, 'Iterations')
         title_newton_iter = f"{newton_pl} - Liczba iteracji\n({sc_pl}, iterowany $x_0$)"
         fname_newton_iter = f"heatmap_iteracje_{newton_pl}_x0iter_{sc_key}"
-        create_heatmap(pivot_newton_iter, title_newton_iter, fname_newton_iter, x_axis_label="Iterowany punkt startowy $x_0$", cmap=CMAP_ITER, val_label=CMAP_ITER_LABEL, annot=True, output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI)
+        heatmap_jobs.append(partial(create_heatmap, pivot_newton_iter, title_newton_iter, fname_newton_iter, x_axis_label="Iterowany punkt startowy $x_0$", cmap=CMAP_ITER, val_label=CMAP_ITER_LABEL, annot=True, output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI))
 
         # Metoda siecznych - x0 = a_bound (stałe), x1 iterowane
-        pivot_sec_a_iter = create_pivot_table(df, 'Secant', sc_key, fixed_x0_val_filter=a_bound, val_col='Iterations')
+        pivot_sec_a_iter = pivot_values(pivots_sec_a, 'Iterations')
         title_sec_a_iter = f"{secant_pl} (stałe $x_0={a_bound:.2f}$) - Liczba iteracji\n({sc_pl}, iterowany $x_1$)"
         fname_sec_a_iter = f"heatmap_iteracje_{secant_pl}_x0staleA_x1iter_{sc_key}"
-        create_heatmap(pivot_sec_a_iter, title_sec_a_iter, fname_sec_a_iter, x_axis_label="Iterowany punkt $x_1$", cmap=CMAP_ITER, val_label=CMAP_ITER_LABEL, annot=True, output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI)
+        heatmap_jobs.append(partial(create_heatmap, pivot_sec_a_iter, title_sec_a_iter, fname_sec_a_iter, x_axis_label="Iterowany punkt $x_1$", cmap=CMAP_ITER, val_label=CMAP_ITER_LABEL, annot=True, output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI))
 
         # Metoda siecznych - x1 = b_bound (stałe), x1 iterowane
-        pivot_sec_b_iter = create_pivot_table(df, 'Secant', sc_key, fixed_x0_val_filter=b_bound, val_col='Iterations')
+        pivot_sec_b_iter = pivot_values(pivots_sec_b, 'Iterations')
         title_sec_b_iter = f"{secant_pl} (stałe $x_1={b_bound:.2f}$) - Liczba iteracji\n({sc_pl}, iterowany $x_0$)"
         fname_sec_b_iter = f"heatmap_iteracje_{secant_pl}_x1staleB_x0iter_{sc_key}"
-        create_heatmap(pivot_sec_b_iter, title_sec_b_iter, fname_sec_b_iter, x_axis_label="Iterowany punkt $x_0$", cmap=CMAP_ITER, val_label=CMAP_ITER_LABEL, annot=True, output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI)
+        heatmap_jobs.append(partial(create_heatmap, pivot_sec_b_iter, title_sec_b_iter, fname_sec_b_iter, x_axis_label="Iterowany punkt $x_0$", cmap=CMAP_ITER, val_label=CMAP_ITER_LABEL, annot=True, output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI))
 
-        df['RootError'] = df.apply(lambda row: min(abs(row['Root'] - REFERENCE_ROOT_1), abs(row['Root'] - REFERENCE_ROOT_2)) if row['Status'] == 0 and pd.notna(row['Root']) else np.nan, axis=1)
-        max_possible_error_proxy = 10.0
-        df['RootError_Plot'] = df['RootError'].fillna(max_possible_error_proxy)
-
-        pivot_err_newton = create_pivot_table(df, 'Newton', sc_key, val_col='RootError_Plot', aggfunc='min')
+        pivot_err_newton = pivot_values(pivots_newton, 'RootError')
         title_err_newton = f"{newton_pl} - Błąd bezwzględny pierwiastka\n({sc_pl}, iterowany $x_0$)"
         fname_err_newton = f"heatmap_blad_{newton_pl}_x0iter_{sc_key}"
-        create_heatmap(pivot_err_newton, title_err_newton, fname_err_newton, x_axis_label="Iterowany punkt startowy $x_0$", cmap=CMAP_ERROR, val_label=CMAP_ERROR_LABEL, log_norm=True, annot=True, annot_fmt=".1e", output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI)
+        heatmap_jobs.append(partial(create_heatmap, pivot_err_newton, title_err_newton, fname_err_newton, x_axis_label="Iterowany punkt startowy $x_0$", cmap=CMAP_ERROR, val_label=CMAP_ERROR_LABEL, log_norm=True, annot=True, annot_fmt=".1e", output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI))
 
-        pivot_err_sec_a = create_pivot_table(df, 'Secant', sc_key, fixed_x0_val_filter=a_bound, val_col='RootError_Plot', aggfunc='min')
+        pivot_err_sec_a = pivot_values(pivots_sec_a, 'RootError')
         title_err_sec_a = f"{secant_pl} (stałe $x_0={a_bound:.2f}$) - Błąd bezwzględny pierwiastka\n({sc_pl}, iterowany $x_1$)"
         fname_err_sec_a = f"heatmap_blad_{secant_pl}_x0staleA_x1iter_{sc_key}"
-        create_heatmap(pivot_err_sec_a, title_err_sec_a, fname_err_sec_a, x_axis_label="Iterowany punkt $x_1$", cmap=CMAP_ERROR, val_label=CMAP_ERROR_LABEL, log_norm=True, annot=True, annot_fmt=".1e", output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI)
+        heatmap_jobs.append(partial(create_heatmap, pivot_err_sec_a, title_err_sec_a, fname_err_sec_a, x_axis_label="Iterowany punkt $x_1$", cmap=CMAP_ERROR, val_label=CMAP_ERROR_LABEL, log_norm=True, annot=True, annot_fmt=".1e", output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI))
 
-        pivot_err_sec_b = create_pivot_table(df, 'Secant', sc_key, fixed_x0_val_filter=b_bound, val_col='RootError_Plot', aggfunc='min')
+        pivot_err_sec_b = pivot_values(pivots_sec_b, 'RootError')
         title_err_sec_b = f"{secant_pl} (stałe $x_1={b_bound:.2f}$) - Błąd bezwzględny pierwiastka\n({sc_pl}, iterowany $x_0$)"
         fname_err_sec_b = f"heatmap_blad_{secant_pl}_x1staleB_x0iter_{sc_key}"
-        create_heatmap(pivot_err_sec_b, title_err_sec_b, fname_err_sec_b, x_axis_label="Iterowany punkt $x_0$", cmap=CMAP_ERROR, val_label=CMAP_ERROR_LABEL, log_norm=True, annot=True, annot_fmt=".1e", output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI)
+        heatmap_jobs.append(partial(create_heatmap, pivot_err_sec_b, title_err_sec_b, fname_err_sec_b, x_axis_label="Iterowany punkt $x_0$", cmap=CMAP_ERROR, val_label=CMAP_ERROR_LABEL, log_norm=True, annot=True, annot_fmt=".1e", output_format=OUTPUT_FORMAT, raster_dpi=RASTER_DPI))
+
+    run_heatmap_jobs(heatmap_jobs)
 
     print("\nZakończono generowanie wykresów w języku polskim.")
 
@@ -0,0 +1,386 @@
+"""
+Shared heatmap plotting code for the least-squares approximation labs.
+
+Lab5 (algebraic polynomials, column 'M') and Lab6 (trigonometric polynomials,
+column 'm') write the same CSV layout: N, <degree column>, MaxAbsoluteError,
+MeanSquaredError. Each lab's src/plot_heatmaps.py only sets its own paths,
+labels and limits and calls run().
+"""
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg') # Non-interactive backend, also used by the worker processes
+import matplotlib.pyplot as plt
+import matplotlib.colors as colors
+from matplotlib.collections import LineCollection
+import numpy as np
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+# You might need to adjust rcParams for font embedding, especially for PDF
+# matplotlib.rcParams['pdf.fonttype'] = 42 # Embed TrueType fonts
+# matplotlib.rcParams['ps.fonttype'] = 42
+
+# --- Shared configuration settings ---
+CMAP = "viridis" # Colormap for heatmaps (e.g., viridis, plasma, inferno, magma, cividis)
+VECTOR_FORMATS = ['pdf', 'svg', 'eps']
+RASTER_DPI = 300 # DPI for raster formats (e.g., PNG). Ignored for vector formats. 300 DPI is good for printing.
+# Tokens written by the C programs for non-finite values; parsed straight to NaN
+CSV_NA_VALUES = ['NAN', 'nan', 'NaN', 'INF', 'inf', 'Inf', '-INF', '-inf', '-Inf']
+VALUE_COLS = ['MaxAbsoluteError', 'MeanSquaredError']
+Y_AXIS_LABEL = "Number of Points (N)"
+# Above this many cells the annotations are dropped (one text artist per cell).
+# The default annotated ranges are ~610 (Lab5) and ~1270 (Lab6) cells.
+ANNOT_MAX_CELLS = 1500
+CACHE_FILENAME = ".heatmap_cache.npz" # Parsed CSV columns, stored in the data directory
+CACHE_VERSION = 2 # Bump when the cached arrays change (dtype, cleaning), so old caches are rebuilt
+
+def _prepare_heatmaps(n_arr, m_arr, value_arrs, n_limit=None, m_limit=None, col_col_name='M'):
+    """
+    Builds the heatmap grids for several value columns in one pass.
+
+    The (N, M) axes only depend on the limits, so the filtering and the cell
+    indices are computed once and shared by every column in value_arrs.
+
+    Args:
+        n_arr (np.ndarray): N value of every data row.
+        m_arr (np.ndarray): M (or m) value of every data row.
+        value_arrs (dict): Column name -> array of error values (one per row).
+        n_limit (int, optional): Maximum N value to include. Defaults to None.
+        m_limit (int, optional): Maximum M value to include. Defaults to None.
+        col_col_name (str): Name of the X-axis column, used in messages.
+
+    Returns:
+        dict: value_col -> (mat, n_vals, m_vals, norm, cbar_label), or None if
+        no data is left after filtering.
+    """
+    # --- Filter data if limits are provided ---
+    # One boolean mask over the column arrays instead of copying them
+    mask = np.ones(len(n_arr), dtype=bool)
+    if n_limit is not None:
+        mask &= n_arr <= n_limit
+    if m_limit is not None:
+        mask &= m_arr <= m_limit
+
+    if not mask.any():
+        return None
+
+    # --- Pivot the data ---
+    # Axes swapped: N as index (Y-axis), M as columns (X-axis)
+    # N and M are small integers, so the grid is built directly with NumPy
+    # (sorted axis values + inverse indices) instead of going through DataFrame.pivot.
+    n_vals, row_idx = np.unique(n_arr[mask], return_inverse=True)
+    m_vals, col_idx = np.unique(m_arr[mask], return_inverse=True)
+
+    flat_idx = row_idx * len(m_vals) + col_idx
+    _, counts = np.unique(flat_idx, return_counts=True)
+    has_duplicates = (counts > 1).any()
+
+    grids = {}
+    for value_col, col_values in value_arrs.items():
+        values = col_values[mask] # Boolean indexing returns a copy (Inf already mapped to NaN at load)
+
+        if has_duplicates:
+            print(f"Warning: Duplicate (N, {col_col_name}) pairs found for {value_col}. Aggregating using mean.")
+            valid = ~np.isnan(values)
+            sums = np.zeros(len(n_vals) * len(m_vals))
+            cell_counts = np.zeros(len(n_vals) * len(m_vals))
+            np.add.at(sums, flat_idx[valid], values[valid])
+            np.add.at(cell_counts, flat_idx[valid], 1)
+            mat = np.full(len(n_vals) * len(m_vals), np.nan)
+            np.divide(sums, cell_counts, out=mat, where=cell_counts > 0)
+            mat = mat.reshape(len(n_vals), len(m_vals))
+        else:
+            mat = np.full((len(n_vals), len(m_vals)), np.nan)
+            mat[row_idx, col_idx] = values
+
+        # Color scale limits: two masked reductions over the flattened grid
+        flat = mat.ravel()
+        finite = np.isfinite(flat)
+        max_val = np.max(flat, where=finite, initial=-np.inf)
+        min_val = np.min(flat, where=finite & (flat > 0), initial=np.inf)
+
+        if not np.isfinite(min_val):
+            print(f"Warning: No positive data found or min value is non-positive for {value_col}. Using linear scale.")
+            norm = None # Use default linear normalization
+            cbar_label = f'{value_col} (Linear Scale)'
+        else:
+            # Use LogNorm only if min_val is positive and valid
+            norm = colors.LogNorm(vmin=min_val, vmax=max_val)
+            cbar_label = f'{value_col} (Log Scale)'
+
+        grids[value_col] = (mat, n_vals, m_vals, norm, cbar_label)
+    return grids
+
+def _draw_cell_grid(ax, n_rows, n_cols, linewidth=.5, color='white'):
+    """Draws the cell borders as two LineCollections (verticals, horizontals) built from one array each."""
+    xs = np.arange(n_cols + 1) - 0.5
+    ys = np.arange(n_rows + 1) - 0.5
+    verticals = np.empty((len(xs), 2, 2))
+    verticals[:, :, 0] = xs[:, None]
+    verticals[:, :, 1] = [ys[0], ys[-1]]
+    horizontals = np.empty((len(ys), 2, 2))
+    horizontals[:, :, 0] = [xs[0], xs[-1]]
+    horizontals[:, :, 1] = ys[:, None]
+    for segments in (verticals, horizontals):
+        ax.add_collection(LineCollection(segments, linewidths=linewidth, colors=color), autolim=False)
+
+def _set_thinned_ticks(ax, axis_index, vals):
+    """
+    Labels every k-th cell along one axis, so the labels never overlap.
+
+    Same rule as seaborn's xticklabels='auto': as many labels as fit into the
+    axis length at the tick label font height, evenly skipped.
+    """
+    axis = (ax.xaxis, ax.yaxis)[axis_index]
+    bbox = ax.get_window_extent().transformed(ax.figure.dpi_scale_trans.inverted())
+    size = (bbox.width, bbox.height)[axis_index] # Axis length in inches
+    tick, = axis.set_ticks([0])
+    fontsize = tick.label1.get_size() # Points
+    max_ticks = int(size // (fontsize / 72))
+    if max_ticks < 1:
+        axis.set_ticks([])
+        return
+    step = len(vals) // max_ticks + 1
+    ticks = np.arange(0, len(vals), step)
+    axis.set_ticks(ticks, vals[ticks])
+
+def _labels_overlap(labels):
+    """True if any two tick labels overlap on the drawn figure (as seaborn's axis_ticklabels_overlap)."""
+    if not labels:
+        return False
+    bboxes = [label.get_window_extent() for label in labels]
+    return max(bbox.count_overlaps(bboxes) for bbox in bboxes) > 1
+
+def _rotate_tick_labels(fig, ax):
+    """
+    Rotates the tick labels the way sns.heatmap does.
+
+    Y labels start vertical; after one draw (to know the text extents) the X
+    labels turn vertical and the Y labels horizontal if they overlap.
+    """
+    plt.setp(ax.get_yticklabels(), rotation='vertical', va='center')
+    fig.canvas.draw()
+    if _labels_overlap(ax.get_xticklabels()):
+        plt.setp(ax.get_xticklabels(), rotation='vertical')
+    if _labels_overlap(ax.get_yticklabels()):
+        plt.setp(ax.get_yticklabels(), rotation='horizontal')
+
+def _render_heatmap(grid, title, output_path, x_axis_label, output_format='png', raster_dpi=150, annotated=False, fmt=".1e", annot_kws=None, cmap=CMAP):
+    """
+    Draws and saves a heatmap prepared by _prepare_heatmaps.
+
+    Args:
+        grid (tuple): (mat, n_vals, m_vals, norm, cbar_label) for one value column.
+        title (str): Title for the heatmap plot.
+        output_path (str): Full path of the output file (including extension).
+        x_axis_label (str): Label of the X-axis (degree / harmonic column).
+        output_format (str): Output file format ('png', 'pdf', 'svg', 'eps').
+        raster_dpi (int): DPI for raster formats (ignored for vector).
+        annotated (bool): Whether to overlay values on the heatmap cells (up to ANNOT_MAX_CELLS cells).
+        fmt (str): Format string for annotations.
+        annot_kws (dict): Additional keyword arguments for annotations.
+        cmap (str): Colormap name.
+    """
+    mat, n_vals, m_vals, norm, cbar_label = grid
+    print(f"Generating heatmap: {title} -> {output_path}") # Shows the full path
+
+    # --- Plotting ---
+    fig, ax = plt.subplots(figsize=(12, 8)) # Figure size might need adjustment
+
+    current_annot_kws = annot_kws if annot_kws is not None else {}
+    do_annot = annotated and mat.size <= ANNOT_MAX_CELLS
+    if annotated and not do_annot:
+        print(f"Skipping annotations: {mat.size} cells exceed ANNOT_MAX_CELLS={ANNOT_MAX_CELLS}.")
+
+    # Single image artist instead of per-cell patches (seaborn) - much lighter for vector output
+    im = ax.imshow(
+        mat,
+        cmap=cmap,
+        norm=norm, # Apply LogNorm or linear norm
+        aspect='auto',
+        interpolation='nearest'
+    )
+    fig.colorbar(im, ax=ax, label=cbar_label)
+    _set_thinned_ticks(ax, 0, m_vals)
+    _set_thinned_ticks(ax, 1, n_vals)
+    _rotate_tick_labels(fig, ax)
+    if output_format not in VECTOR_FORMATS:
+        # Cell borders for raster output only; in vector output they would be barely visible but add one path per line
+        _draw_cell_grid(ax, *mat.shape)
+
+    if do_annot:
+        # Pick dark/white text depending on the cell's relative luminance (as seaborn: linearized sRGB, threshold .408)
+        rgb = im.cmap(im.norm(mat))[..., :3]
+        rgb = np.where(rgb <= .03928, rgb / 12.92, ((rgb + .055) / 1.055) ** 2.4)
+        luminance = rgb @ np.array([0.2126, 0.7152, 0.0722])
+        labels = np.char.mod('%' + fmt, mat) # All annotation strings in one vectorized call
+        for i, j in zip(*np.nonzero(np.isfinite(mat))):
+            ax.text(j, i, labels[i, j], ha='center', va='center',
+                    color='.15' if luminance[i, j] > .408 else 'w',
+                    **current_annot_kws) # Pass annotation keywords
+
+    ax.set_title(title)
+    # Axis labels swapped
+    ax.set_xlabel(x_axis_label)
+    ax.set_ylabel(Y_AXIS_LABEL)
+    # ax.invert_yaxis()
+
+    # --- SAVING ---
+    try:
+        save_kwargs = {'bbox_inches': 'tight', 'format': output_format}
+        if output_format not in VECTOR_FORMATS:
+            save_kwargs['dpi'] = raster_dpi # Add DPI for raster formats
+
+        fig.savefig(output_path, **save_kwargs)
+        print(f"Saved plot: {output_path}")
+    except Exception as e:
+        print(f"Error saving plot {output_path}: {e}")
+    plt.close(fig) # Close this figure explicitly to free memory
+
+def _run_render_jobs(render_jobs):
+    """Renders independent heatmaps in parallel worker processes; each job is a partial of _render_heatmap."""
+    if not render_jobs:
+        return
+    with ProcessPoolExecutor(max_workers=min(len(render_jobs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(job) for job in render_jobs]
+        for future in futures:
+            future.result() # Re-raise any worker error in the main process
+
+def read_heatmap_csv(csv_file, col_col_name='M'):
+    """Reads the heatmap CSV in a single typed pass (pyarrow engine if installed, C engine otherwise)."""
+    dtypes = {'N': 'Int64', col_col_name: 'Int64', **{col: 'float64' for col in VALUE_COLS}}
+    try:
+        return pd.read_csv(csv_file, engine='pyarrow', dtype=dtypes, na_values=CSV_NA_VALUES)
+    except ImportError:
+        return pd.read_csv(csv_file, engine='c', dtype=dtypes, na_values=CSV_NA_VALUES)
+
+def load_heatmap_arrays(csv_file, col_col_name='M'):
+    """
+    Returns (n_arr, m_arr, value_arrs) for the heatmap CSV, parsing it only when it changed.
+
+    The parsed columns are cached next to the CSV in CACHE_FILENAME (.npz), keyed by
+    the CSV modification time and size; a stale or unreadable cache is simply rebuilt.
+    """
+    c = col_col_name
+    cache_file = os.path.join(os.path.dirname(csv_file), CACHE_FILENAME)
+    key = f"{os.path.getmtime(csv_file)}_{os.path.getsize(csv_file)}_{c}_v{CACHE_VERSION}"
+
+    if os.path.exists(cache_file):
+        try:
+            with np.load(cache_file) as cache:
+                if str(cache['key']) == key:
+                    print(f"Using cached heatmap data: {cache_file}")
+                    return cache['N'], cache['M'], {col: cache[col] for col in VALUE_COLS}
+        except Exception as e: # Corrupt or incompatible cache file
+            print(f"Warning: Ignoring unreadable cache {cache_file}: {e}")
+
+    try:
+        df = read_heatmap_csv(csv_file, c)
+    except pd.errors.EmptyDataError:
+        print(f"Error: Data file {csv_file} is empty.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading CSV file {csv_file}: {e}")
+        sys.exit(1)
+
+    # --- Basic Data Validation ---
+    required_cols = ['N', c] + VALUE_COLS
+    if not all(col in df.columns for col in required_cols):
+        print(f"Error: CSV file {csv_file} is missing required columns.")
+        print(f"Expected: {required_cols}")
+        print(f"Found: {list(df.columns)}")
+        sys.exit(1)
+
+    df.dropna(subset=['N', c], inplace=True) # Drop rows where N or M couldn't be parsed
+    # Keep one contiguous array per column from here on; the DataFrame is not needed anymore
+    # N and M are small bounded integers: int16 halves the bytes touched by every mask/compare
+    n_arr = df['N'].to_numpy(np.int16)
+    m_arr = df[c].to_numpy(np.int16)
+    value_arrs = {col: df[col].to_numpy(np.float64, copy=True) for col in VALUE_COLS} # Own the data, cleaned in place below
+    del df
+    for values in value_arrs.values():
+        np.copyto(values, np.nan, where=~np.isfinite(values)) # Overflowed values -> NaN, once for all plots
+
+    try:
+        np.savez(cache_file, key=key, N=n_arr, M=m_arr, **value_arrs)
+    except OSError as e:
+        print(f"Warning: Could not write cache {cache_file}: {e}")
+    return n_arr, m_arr, value_arrs
+
+def run(csv_file, output_dir, col_col_name, x_axis_label, output_format='svg', annot_n_limit=30, annot_m_limit=20,
+        file_prefix='', annot_file_prefix='annotated_', title_suffix='', annot_title_suffix='',
+        annot_font_size=5, raster_dpi=RASTER_DPI, cmap=CMAP, executable='approximation_app'):
+    """
+    Reads the heatmap CSV of one lab and generates its standard and annotated heatmaps.
+
+    Args:
+        csv_file (str): Path to the CSV written by the C program.
+        output_dir (str): Directory for the generated plots (created if missing).
+        col_col_name (str): Name of the X-axis column ('M' in Lab5, 'm' in Lab6).
+        x_axis_label (str): Label of the X-axis.
+        output_format (str): Output file format ('png', 'pdf', 'svg', 'eps').
+        annot_n_limit (int): Upper limit for N in annotated heatmaps.
+        annot_m_limit (int): Upper limit for the X-axis column in annotated heatmaps.
+        file_prefix (str): Filename prefix of the standard heatmaps.
+        annot_file_prefix (str): Filename prefix of the annotated heatmaps.
+        title_suffix (str): Suffix appended to the standard heatmap titles.
+        annot_title_suffix (str): Suffix appended to the annotated heatmap titles.
+        annot_font_size (int): Font size for annotations.
+        raster_dpi (int): DPI for raster formats (ignored for vector).
+        cmap (str): Colormap name.
+        executable (str): Name of the lab's C binary, used in the missing-data hint.
+    """
+    c = col_col_name
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Reading heatmap data from: {csv_file}")
+    print(f"Output format set to: {output_format}")
+    if not os.path.exists(csv_file):
+        print(f"Error: Data file not found: {csv_file}")
+        print(f"Please run the C program first ('make run' or './bin/{executable}')")
+        sys.exit(1)
+
+    n_arr, m_arr, value_arrs = load_heatmap_arrays(csv_file, col_col_name)
+
+    def job(grid, title, base_filename, **kwargs):
+        output_path = os.path.join(output_dir, f"{base_filename}.{output_format}")
+        return partial(_render_heatmap, grid, title, output_path, x_axis_label,
+                       output_format=output_format, raster_dpi=raster_dpi, cmap=cmap, **kwargs)
+
+    render_jobs = [] # The four figures are independent; collected here and rendered in parallel below
+
+    # --- Generate Standard Heatmaps ---
+    grids = _prepare_heatmaps(n_arr, m_arr, value_arrs, col_col_name=c)
+    if grids is None:
+        print("Warning: No data available for the standard heatmaps. Skipping plots.")
+    else:
+        render_jobs.append(job(grids['MaxAbsoluteError'], f'Max Absolute Error (Log Scale, {c} vs N){title_suffix}',
+                               f'{file_prefix}max_error_heatmap'))
+        render_jobs.append(job(grids['MeanSquaredError'], f'Mean Squared Error (Log Scale, {c} vs N){title_suffix}',
+                               f'{file_prefix}mse_heatmap'))
+
+    # --- Generate Annotated Heatmaps (Limited Range) ---
+    max_n_data = n_arr.max()
+    max_m_data = m_arr.max()
+    # Grids for the annotated plot range (filtered once for both error columns)
+    annotated_grids = _prepare_heatmaps(n_arr, m_arr, value_arrs, n_limit=annot_n_limit, m_limit=annot_m_limit, col_col_name=c)
+
+    if annotated_grids is not None:
+        print(f"\nGenerating annotated plots for N <= {annot_n_limit}, {c} <= {annot_m_limit}")
+        annot_kwargs = {'annotated': True, 'fmt': ".1e", 'annot_kws': {"size": annot_font_size}} # Scientific format
+        render_jobs.append(job(annotated_grids['MaxAbsoluteError'],
+                               f'Max Absolute Error (Log Scale, {c}<={annot_m_limit}, N<={annot_n_limit}){annot_title_suffix}',
+                               f'{annot_file_prefix}max_error_heatmap', **annot_kwargs))
+        render_jobs.append(job(annotated_grids['MeanSquaredError'],
+                               f'Mean Squared Error (Log Scale, {c}<={annot_m_limit}, N<={annot_n_limit}){annot_title_suffix}',
+                               f'{annot_file_prefix}mse_heatmap', **annot_kwargs))
+    else:
+        print(f"\nSkipping annotated plots: No data found within the specified limits (N<={annot_n_limit}, {c}<={annot_m_limit}).")
+        # Provide context if data range is smaller than annotation limits
+        if max_n_data < annot_n_limit or max_m_data < annot_m_limit:
+            print(f"(Data range max N={max_n_data}, max {c}={max_m_data})")
+
+    _run_render_jobs(render_jobs)
+
+    print("\nPython plotting finished.")